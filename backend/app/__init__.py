@@ -0,0 +1,4 @@
+from dotenv import find_dotenv, load_dotenv
+
+# Submodules read their settings at import time, so .env must be loaded first
+load_dotenv(find_dotenv())
@@ -1,8 +1,18 @@
+import secrets
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
 from app.services.llm_service import LLMService
 from app.services.ocr_service import OCRService
+from app.services.result_store import ResultStore
 
 ocr_service_instance: OCRService | None = None
 llm_service_instance: LLMService | None = None
+result_store_instance: ResultStore | None = None
+export_token: str | None = None
+
+export_bearer = HTTPBearer(auto_error=False)
 
 
 def get_ocr_service() -> OCRService:
@@ -29,3 +39,33 @@ def get_llm_service() -> LLMService:
     if llm_service_instance is None:
         raise RuntimeError("LLM Service not initialized in lifespan!")
     return llm_service_instance
+
+
+def get_result_store() -> ResultStore | None:
+    """
+    Retrieves the ResultStore instance.
+    Returns:
+        Optional[ResultStore]: The result store, or None if persistence is disabled.
+    """
+    return result_store_instance
+
+
+def require_export_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(export_bearer),
+) -> None:
+    """
+    Guards the bulk export endpoint with a bearer token.
+    Raises:
+        HTTPException: 404 if export is not enabled (no token configured),
+                       401 if the request does not carry the configured token.
+    """
+    if export_token is None:
+        raise HTTPException(status_code=404, detail="Export is not enabled")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), export_token.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or missing export token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
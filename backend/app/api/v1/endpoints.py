@@ -1,4 +1,6 @@
 import json
+import time
+from typing import Literal
 
 from fastapi import (
     APIRouter,
@@ -6,17 +8,40 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
     Request,
     Response,
     UploadFile,
 )
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from app.api.dependencies import get_llm_service, get_ocr_service
-from app.core.exception import InvalidFileError, LLMProcessingError, OCRProcessingError
+from app.api.dependencies import (
+    get_llm_service,
+    get_ocr_service,
+    get_result_store,
+    require_export_token,
+)
+from app.core.concurrency import concurrency_limiter
+from app.core.exception import (
+    InvalidFileError,
+    LLMProcessingError,
+    LLMUnavailableError,
+    OCRProcessingError,
+)
+from app.core.health import (
+    MAX_EVENT_LOOP_LAG,
+    event_loop_monitor,
+    ocr_probe,
+    worker_pool_stats,
+)
 from app.core.limiter import limiter
+from app.core.serialization import render, resolve_format
+from app.services import export_service
 from app.services.llm_service import LLMService
 from app.services.ocr_service import OCRService
+from app.services.result_store import ResultStore
 
 router = APIRouter()
 
@@ -67,8 +92,15 @@ async def extract_document(
     schema_config: str | None = Form(
         None, description="JSON string defining desired output structure"
     ),
+    include_raw_text: bool = Query(True, description="Include the OCR text in the response"),
+    include_schema: bool = Query(True, description="Echo the extraction schema used"),
+    include_layout: bool = Query(False, description="Include OCR line boxes and scores"),
+    response_format: Literal["json", "msgpack"] | None = Query(
+        None, alias="format", description="Response encoding; defaults to the Accept header"
+    ),
     ocr: OCRService = Depends(get_ocr_service),
     llm: LLMService = Depends(get_llm_service),
+    store: ResultStore | None = Depends(get_result_store),
 ):
     """
     Endpoint to extract structured data from an uploaded document (PDF/Image).
@@ -76,12 +108,19 @@ async def extract_document(
     Args:
         file (UploadFile): The uploaded file (PDF/Image).
         schema_config (Optional[str]): JSON string defining desired output structure.
+        include_raw_text (bool): Whether to return the OCR text.
+        include_schema (bool): Whether to echo the extraction schema used.
+        include_layout (bool): Whether to return OCR line boxes and scores.
+        response_format (Optional[str]): "json" or "msgpack"; negotiated from Accept if unset.
         ocr (OCRService): An instance of the OCRService for text extraction.
         llm (LLMService): An instance of the LLMService for structured data parsing.
+        store (Optional[ResultStore]): Where successful extractions are persisted, if enabled.
 
     Returns:
-        Dict[str, Any]: A dictionary containing the extraction results or error details.
+        Response: The extraction results or error details, encoded as JSON or msgpack.
     """
+    fmt = resolve_format(request, response_format)
+
     if file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(
             status_code=400,
@@ -100,39 +139,142 @@ async def extract_document(
         except json.JSONDecodeError as e:
             raise HTTPException(status_code=400, detail="Invalid JSON in schema_config") from e
 
+    if not concurrency_limiter.try_acquire():
+        raise HTTPException(
+            status_code=429,
+            detail="Server is at capacity, retry later",
+            headers={"Retry-After": str(concurrency_limiter.retry_after())},
+        )
+
+    latencies: dict[str, float] = {}
     try:
         # OCR Extraction
-        raw_text = ocr.extract_text(file_bytes, file.filename)
+        started = time.perf_counter()
+        layout = None
+        ocr_stats: dict[str, int] = {}
+        try:
+            if include_layout:
+                layout = await run_in_threadpool(
+                    ocr.extract_lines, file_bytes, file.filename, ocr_stats
+                )
+                raw_text = " ".join(line["text"] for line in layout)
+            else:
+                raw_text = await run_in_threadpool(
+                    ocr.extract_text, file_bytes, file.filename, ocr_stats
+                )
+        except InvalidFileError:
+            raise
+        except Exception:
+            # A slow failure is still an overload signal; the pages done are unknown,
+            # so the whole elapsed time counts as one sample
+            latencies["ocr"] = time.perf_counter() - started
+            raise
+        ocr_seconds = time.perf_counter() - started
+        # OCR time grows with page count, so the limiter is fed seconds per OCR'd page
+        ocr_pages = max(1, ocr_stats.get("pages", 1) - ocr_stats.get("pages_reused", 0))
+        latencies["ocr"] = ocr_seconds / ocr_pages
 
         if not raw_text.strip():
-            return {
+            payload = {
                 "status": "failed",
                 "filename": file.filename,
                 "message": "No text detected in document",
                 "data": None,
-                "raw_text": None,
             }
+            if include_raw_text:
+                payload["raw_text"] = None
+            return render(payload, fmt, negotiated=response_format is None)
 
         # LLM Parsing
-        extracted_data = llm.parse_document(raw_text, target_schema)
+        started = time.perf_counter()
+        extracted_data = await run_in_threadpool(llm.parse_document, raw_text, target_schema)
+        latencies["llm"] = time.perf_counter() - started
 
-        return {
+        payload = {
             "status": "success",
             "filename": file.filename,
-            "extraction_schema_used": target_schema,
             "data": extracted_data,
-            "raw_text": raw_text,
         }
+        if store is not None:
+            try:
+                payload["extraction_id"] = await run_in_threadpool(
+                    store.append,
+                    file_bytes,
+                    file.filename,
+                    target_schema,
+                    extracted_data,
+                    {"ocr": ocr_seconds, "llm": latencies["llm"]},
+                    ocr_stats,
+                )
+            except OSError as e:
+                logger.error(f"Failed to persist extraction result: {e}")
+        if include_schema:
+            payload["extraction_schema_used"] = target_schema
+        if include_raw_text:
+            payload["raw_text"] = raw_text
+        if include_layout:
+            payload["layout"] = layout
+        if ocr_stats:
+            payload["ocr"] = ocr_stats
+        return render(payload, fmt, negotiated=response_format is None)
 
     except InvalidFileError as e:
         raise HTTPException(status_code=400, detail=e.messages) from e
     except OCRProcessingError as e:
         raise HTTPException(status_code=500, detail=f"OCR failed: {e.messages}") from e
+    except LLMUnavailableError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"LLM unavailable: {e.messages}",
+            headers={"Retry-After": str(e.details.get("retry_after", 1))},
+        ) from e
     except LLMProcessingError as e:
         raise HTTPException(status_code=500, detail=f"LLM failed: {e.messages}") from e
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error") from e
+    finally:
+        concurrency_limiter.release(latencies)
+
+
+@router.get("/export", dependencies=[Depends(require_export_token)])
+@limiter.limit("10/minute")
+async def export_results(
+    request: Request,
+    response: Response,
+    table: Literal["extractions", "fields", "line_items"] = Query(
+        "extractions", description="Extraction rows, or their fields/line items as key-value rows"
+    ),
+    export_format: Literal["parquet", "arrow"] = Query(
+        "parquet", alias="format", description="Parquet or Arrow IPC file"
+    ),
+    store: ResultStore | None = Depends(get_result_store),
+):
+    """
+    Endpoint to bulk export persisted extraction results in a columnar format.
+
+    The file is streamed batch by batch, so memory stays bounded however many
+    extractions are stored. Export is disabled unless EXPORT_API_TOKEN is set, and
+    requests must send it as a bearer token.
+
+    Args:
+        table (str): "extractions" (one row per document), "fields" (one row per field) or
+                     "line_items" (one row per item attribute).
+        export_format (str): "parquet" or "arrow".
+        store (Optional[ResultStore]): The result store to export.
+
+    Returns:
+        StreamingResponse: The encoded file.
+    """
+    if store is None:
+        raise HTTPException(status_code=404, detail="Result persistence is not enabled")
+
+    media_type, extension = export_service.EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        export_service.iter_export(store, table, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table}.{extension}"'},
+    )
 
 
 @router.get("/health")
@@ -150,4 +292,57 @@ async def health_check(
             "ocr": "ready" if ocr else "not_initialized",
             "llm": "ready" if llm else "not_initialized",
         },
+        "concurrency": concurrency_limiter.snapshot(),
+    }
+
+
+@router.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and its event loop is responding"""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness_check(
+    response: Response,
+    ocr: OCRService = Depends(get_ocr_service),
+    llm: LLMService = Depends(get_llm_service),
+):
+    """
+    Readiness probe: whether this instance should receive extraction traffic.
+
+    Checks a cached tiny OCR inference and event-loop lag, and responds with 503 when
+    any check fails so the orchestrator can route traffic away before requests start
+    timing out. The LLM circuit state and admission concurrency are reported but not
+    checked: both follow the shared LLM (the limit backs off on its latency), so failing
+    on them would take every instance out of rotation at once, and /extract already
+    sheds load with 429s.
+
+    Args:
+        ocr (OCRService): An instance of the OCRService to probe.
+        llm (LLMService): An instance of the LLMService whose circuit state is reported.
+
+    Returns:
+        Dict[str, Any]: Overall status and the individual check results.
+    """
+    ocr_check = await ocr_probe.check(ocr)
+    concurrency = concurrency_limiter.snapshot()
+    llm_circuit = llm.circuit.state
+
+    checks = {
+        "ocr": ocr_check["ok"],
+        "event_loop": event_loop_monitor.lag <= MAX_EVENT_LOOP_LAG,
+    }
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = 503
+
+    return {
+        "status": "ready" if ready else "not_ready",
+        "checks": checks,
+        "ocr_probe": ocr_check,
+        "event_loop_lag_seconds": round(event_loop_monitor.lag, 3),
+        "worker_pool": worker_pool_stats(),
+        "concurrency": concurrency,
+        "llm_circuit": llm_circuit,
     }
@@ -0,0 +1,101 @@
+import threading
+import time
+
+from loguru import logger
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker guarding calls to an external dependency.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are rejected
+    without reaching the dependency. Once `reset_timeout` seconds have passed, a single
+    trial call is let through (half-open); its outcome closes or re-opens the circuit.
+
+    Attributes:
+        name (str): Name of the guarded dependency, used in logs.
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds to wait before allowing a trial call.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initializes a closed circuit.
+
+        Args:
+            name (str): Name of the guarded dependency, used in logs.
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds to wait before allowing a trial call.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Returns the current state, moving from open to half-open once the timeout elapsed."""
+        with self._lock:
+            if self._state == self.OPEN and self._timeout_elapsed():
+                return self.HALF_OPEN
+            return self._state
+
+    def _timeout_elapsed(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def allow_request(self) -> bool:
+        """
+        Checks whether a call may go through.
+
+        Returns:
+            bool: False while the circuit is open or a half-open trial is already running.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and not self._timeout_elapsed():
+                return False
+            if self._trial_in_progress:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_progress = True
+            return True
+
+    def record_success(self) -> None:
+        """Records a successful call, closing the circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"{self.name} circuit closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """Records a failed call, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_progress = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"{self.name} circuit opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def retry_after(self) -> int:
+        """
+        Returns the number of seconds until a trial call will be allowed.
+
+        Returns:
+            int: Seconds until the circuit half-opens (at least 1).
+        """
+        with self._lock:
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+        return max(1, int(remaining + 0.999))
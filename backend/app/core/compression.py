@@ -0,0 +1,120 @@
+import gzip
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSIBLE_MEDIA_TYPES = {"application/json", "application/msgpack"}
+
+# Content encodings this server can produce, in order of preference
+SUPPORTED_ENCODINGS = ("zstd", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Picks the best supported encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): Raw Accept-Encoding header value.
+
+    Returns:
+        Optional[str]: The chosen encoding, or None if the client accepts none of ours.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token.strip().lower()] = quality
+
+    candidates = [
+        (accepted.get(enc, accepted.get("*", 0.0)), -i, enc)
+        for i, enc in enumerate(SUPPORTED_ENCODINGS)
+    ]
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compresses a response body with the given encoding.
+
+    Args:
+        body (bytes): The uncompressed body.
+        encoding (str): Either "gzip" or "zstd".
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware negotiating gzip/zstd compression for JSON and msgpack responses.
+
+    Only single-chunk responses are compressed; streamed bodies pass through untouched
+    so that streaming endpoints keep their bounded memory profile.
+
+    Attributes:
+        app (ASGIApp): The wrapped ASGI application.
+        minimum_size (int): Bodies smaller than this are sent uncompressed.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip()
+            body = message.get("body", b"")
+
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or media_type not in COMPRESSIBLE_MEDIA_TYPES
+                or len(body) < self.minimum_size
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,139 @@
+import math
+import os
+
+from loguru import logger
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD admission controller for in-flight extractions, modelled on Netflix concurrency-limits.
+
+    The limit grows by one for every request that completes within its latency targets while
+    the node is at least half busy, and shrinks multiplicatively as soon as a stage (OCR, LLM)
+    exceeds its target. Requests beyond the current limit are rejected so that callers can back off.
+
+    All methods are expected to be called from the event loop thread, so no locking is needed.
+
+    Attributes:
+        limit (float): Current number of extractions admitted concurrently.
+        min_limit (int): Lower bound for the limit.
+        max_limit (int): Upper bound for the limit.
+        latency_targets (Dict[str, float]): Per-stage latency target in seconds.
+        backoff_ratio (float): Factor applied to the limit when a target is breached.
+        in_flight (int): Number of extractions currently admitted.
+        latency_ewma (Dict[str, float]): Smoothed observed latency per stage in seconds.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_targets: dict[str, float],
+        backoff_ratio: float = 0.9,
+        smoothing: float = 0.2,
+    ):
+        """
+        Initializes the limiter.
+
+        Args:
+            initial_limit (int): Starting concurrency limit.
+            min_limit (int): Lower bound for the limit.
+            max_limit (int): Upper bound for the limit.
+            latency_targets (Dict[str, float]): Per-stage latency target in seconds.
+            backoff_ratio (float): Multiplicative decrease applied on a breach.
+            smoothing (float): EWMA weight given to each new latency sample.
+        """
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_targets = latency_targets
+        self.backoff_ratio = backoff_ratio
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency_ewma: dict[str, float] = {}
+
+    @property
+    def current_limit(self) -> int:
+        """Returns the integer number of extractions currently admitted."""
+        return max(self.min_limit, int(self.limit))
+
+    def try_acquire(self) -> bool:
+        """
+        Admits one extraction if the node is below its current limit.
+
+        Returns:
+            bool: True if admitted (the caller must later call `release`), False to shed.
+        """
+        if self.in_flight >= self.current_limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latencies: dict[str, float]) -> None:
+        """
+        Releases an admitted extraction and adapts the limit from its stage latencies.
+
+        Args:
+            latencies (Dict[str, float]): Observed seconds per stage. Stages that did not
+                                          run (e.g. on an early failure) are simply absent.
+        """
+        in_flight = self.in_flight
+        self.in_flight = max(0, self.in_flight - 1)
+        if not latencies:
+            return
+
+        for stage, latency in latencies.items():
+            previous = self.latency_ewma.get(stage, latency)
+            self.latency_ewma[stage] = previous + self.smoothing * (latency - previous)
+
+        breached = [
+            stage
+            for stage, latency in latencies.items()
+            if latency > self.latency_targets.get(stage, math.inf)
+        ]
+        if breached:
+            new_limit = max(self.min_limit, self.limit * self.backoff_ratio)
+            if int(new_limit) < int(self.limit):
+                logger.warning(
+                    f"Latency target breached for {', '.join(breached)}; "
+                    f"concurrency limit {int(self.limit)} -> {int(new_limit)}"
+                )
+            self.limit = new_limit
+        elif in_flight * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    def retry_after(self) -> int:
+        """
+        Estimates how long a shed client should wait before retrying.
+
+        Returns:
+            int: Seconds, based on the smoothed end-to-end service time (at least 1).
+        """
+        service_time = sum(self.latency_ewma.values())
+        return max(1, math.ceil(service_time))
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current limiter state for health reporting.
+
+        Returns:
+            dict: Current limit, in-flight count and smoothed stage latencies.
+        """
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "latency_ewma_seconds": {k: round(v, 3) for k, v in self.latency_ewma.items()},
+            "latency_targets_seconds": self.latency_targets,
+        }
+
+
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=int(os.getenv("EXTRACT_CONCURRENCY_INITIAL", "4")),
+    min_limit=int(os.getenv("EXTRACT_CONCURRENCY_MIN", "1")),
+    max_limit=int(os.getenv("EXTRACT_CONCURRENCY_MAX", "32")),
+    latency_targets={
+        "ocr": float(os.getenv("OCR_LATENCY_TARGET", "10")),
+        "llm": float(os.getenv("LLM_LATENCY_TARGET", "15")),
+    },
+)
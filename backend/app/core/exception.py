@@ -19,6 +19,12 @@ class LLMProcessingError(BaseAppError):
     pass
 
 
+class LLMUnavailableError(LLMProcessingError):
+    """Exception raised when the LLM circuit breaker is open."""
+
+    pass
+
+
 class InvalidFileError(BaseAppError):
     """Exception raised for invalid file inputs."""
 
@@ -0,0 +1,116 @@
+import asyncio
+import contextlib
+import os
+import time
+
+import anyio.to_thread
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+
+from app.services.ocr_service import OCRService
+
+MAX_EVENT_LOOP_LAG = float(os.getenv("READINESS_MAX_EVENT_LOOP_LAG", "0.5"))
+OCR_PROBE_TTL = float(os.getenv("READINESS_OCR_PROBE_TTL", "30"))
+OCR_PROBE_TIMEOUT = float(os.getenv("READINESS_OCR_PROBE_TIMEOUT", "5"))
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed-interval sleep.
+
+    A saturated loop (blocking calls, CPU-bound work on the loop thread) shows up as lag
+    well before requests start timing out.
+
+    Attributes:
+        interval (float): Seconds between samples.
+        lag (float): Lag of the most recent sample in seconds.
+    """
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - started - self.interval)
+
+    def start(self) -> None:
+        """Starts sampling on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+class OCRProbe:
+    """
+    Runs `OCRService.probe` at most once per TTL and caches the outcome.
+
+    Attributes:
+        ttl (float): Seconds a probe result stays valid.
+        timeout (float): Seconds before a probe is considered failed.
+    """
+
+    def __init__(self, ttl: float, timeout: float):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._checked_at: float | None = None
+        self._result: dict = {}
+        self._lock = asyncio.Lock()
+
+    async def check(self, ocr: OCRService) -> dict:
+        """
+        Returns the cached probe result, refreshing it if it has expired.
+
+        Args:
+            ocr (OCRService): The OCR service to probe.
+
+        Returns:
+            dict: `ok` flag, probe `latency_seconds` and `error` if the probe failed.
+        """
+        async with self._lock:
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < self.ttl:
+                return self._result
+
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(run_in_threadpool(ocr.probe), timeout=self.timeout)
+                self._result = {"ok": True}
+            except Exception as e:
+                logger.warning(f"OCR readiness probe failed: {e!r}")
+                self._result = {"ok": False, "error": str(e) or type(e).__name__}
+            self._result["latency_seconds"] = round(time.perf_counter() - started, 3)
+            self._checked_at = time.monotonic()
+            return self._result
+
+
+def worker_pool_stats() -> dict:
+    """
+    Reports utilization of the threadpool that runs OCR and LLM calls.
+
+    Returns:
+        dict: Busy and total workers, utilization ratio and number of tasks waiting.
+    """
+    pool = anyio.to_thread.current_default_thread_limiter()
+    total = pool.total_tokens
+    return {
+        "busy": pool.borrowed_tokens,
+        "total": total,
+        "utilization": round(pool.borrowed_tokens / total, 3) if total else 0.0,
+        "queue_depth": pool.statistics().tasks_waiting,
+    }
+
+
+event_loop_monitor = EventLoopLagMonitor()
+ocr_probe = OCRProbe(ttl=OCR_PROBE_TTL, timeout=OCR_PROBE_TIMEOUT)
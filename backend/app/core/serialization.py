@@ -0,0 +1,77 @@
+from typing import Any
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_ACCEPT_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack"}
+
+
+def _accepted_qualities(accept: str) -> dict[str, float]:
+    """
+    Parses an Accept header into media types and their q-values.
+
+    Args:
+        accept (str): Raw Accept header value.
+
+    Returns:
+        Dict[str, float]: Quality per media type; malformed q-values count as 0.
+    """
+    qualities: dict[str, float] = {}
+    for part in accept.split(","):
+        media_type, *params = (p.strip() for p in part.split(";"))
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        qualities[media_type.lower()] = quality
+    return qualities
+
+
+def resolve_format(request: Request, requested: str | None) -> str:
+    """
+    Resolves the response encoding from the `format` query param or the Accept header.
+
+    msgpack is negotiated only when the client accepts it with a non-zero q-value at
+    least as high as the one it gives to JSON.
+
+    Args:
+        request (Request): The incoming request.
+        requested (Optional[str]): Explicit format from the query string, if any.
+
+    Returns:
+        str: Either "json" or "msgpack".
+    """
+    if requested is not None:
+        return requested
+    qualities = _accepted_qualities(request.headers.get("accept", ""))
+    msgpack_quality = max((qualities.get(t, 0.0) for t in MSGPACK_ACCEPT_TYPES), default=0.0)
+    json_quality = qualities.get("application/json", 0.0)
+    return "msgpack" if msgpack_quality > 0 and msgpack_quality >= json_quality else "json"
+
+
+def render(payload: dict[str, Any], fmt: str, negotiated: bool = False) -> Response:
+    """
+    Encodes a response payload without going through FastAPI's generic encoder.
+
+    Args:
+        payload (Dict[str, Any]): JSON-compatible response payload.
+        fmt (str): Either "json" or "msgpack".
+        negotiated (bool): Whether `fmt` came from the Accept header, in which case
+                           caches are told the response varies with it.
+
+    Returns:
+        Response: The encoded response.
+    """
+    headers = {"Vary": "Accept"} if negotiated else None
+    if fmt == "msgpack":
+        return Response(
+            content=msgpack.packb(payload), media_type=MSGPACK_MEDIA_TYPE, headers=headers
+        )
+    return JSONResponse(content=payload, headers=headers)
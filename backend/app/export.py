@@ -0,0 +1,53 @@
+"""
+Command-line bulk export of persisted extraction results.
+
+Usage:
+    python -m app.export --store-dir results/ --out-dir exports/ --format parquet
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from app.services import export_service
+from app.services.result_store import ResultStore
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Writes every export table (extractions, fields and line_items) of a result store to disk,
+    one `<table>.<format>` file per table in `--out-dir`.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments, defaults to sys.argv.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Export extraction results")
+    parser.add_argument("--store-dir", default=os.getenv("RESULT_STORE_DIR"))
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument(
+        "--format", choices=sorted(export_service.EXPORT_FORMATS), default="parquet"
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    if not args.store_dir:
+        parser.error("--store-dir or RESULT_STORE_DIR is required")
+
+    store = ResultStore(args.store_dir)
+    Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+    _, extension = export_service.EXPORT_FORMATS[args.format]
+    for table in export_service.EXPORT_TABLES:
+        path = Path(args.out_dir) / f"{table}.{extension}"
+        export_service.write_export(store, table, args.format, str(path), args.batch_size)
+        logger.success(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
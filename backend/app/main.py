@@ -1,7 +1,6 @@
 import os
 from contextlib import asynccontextmanager
 
-from dotenv import find_dotenv, load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from huggingface_hub import hf_hub_download
@@ -11,14 +10,22 @@ from slowapi.errors import RateLimitExceeded
 
 from app.api import dependencies
 from app.api.v1 import endpoints
+from app.core.compression import CompressionMiddleware
+from app.core.health import event_loop_monitor
 from app.core.limiter import limiter
 from app.services.llm_service import LLMService
 from app.services.ocr_service import OCRService
+from app.services.page_cache import PageCache
+from app.services.result_store import ResultStore
 
-load_dotenv(find_dotenv())
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise RuntimeError("GROQ_API_KEY must be set in environment variables")
+OCR_PAGE_CACHE_DIR = os.getenv("OCR_PAGE_CACHE_DIR", ".cache/ocr_pages")
+OCR_PAGE_CACHE_MAX_PAGES = int(os.getenv("OCR_PAGE_CACHE_MAX_PAGES", "10000"))
+OCR_MAX_PDF_PAGES = int(os.getenv("OCR_MAX_PDF_PAGES", "50"))
+RESULT_STORE_DIR = os.getenv("RESULT_STORE_DIR")
+EXPORT_API_TOKEN = os.getenv("EXPORT_API_TOKEN") or None
 
 ocr_service = None
 llm_service = None
@@ -34,17 +41,29 @@ async def lifespan(app: FastAPI):
     dict_path = hf_hub_download("monkt/paddleocr-onnx", "languages/english/dict.txt")
 
     global ocr_service, llm_service
-    ocr_service = OCRService(det_path, rec_path, dict_path)
+    page_cache = None
+    if OCR_PAGE_CACHE_MAX_PAGES > 0:
+        page_cache = PageCache(OCR_PAGE_CACHE_DIR, OCR_PAGE_CACHE_MAX_PAGES)
+    ocr_service = OCRService(
+        det_path, rec_path, dict_path, page_cache=page_cache, max_pages=OCR_MAX_PDF_PAGES
+    )
     llm_service = LLMService(api_key=GROQ_API_KEY)
 
     dependencies.ocr_service_instance = ocr_service
     dependencies.llm_service_instance = llm_service
+    if RESULT_STORE_DIR:
+        dependencies.result_store_instance = ResultStore(RESULT_STORE_DIR)
+    dependencies.export_token = EXPORT_API_TOKEN
+    event_loop_monitor.start()
 
     yield
 
     logger.info("--- Shutting down IDP Service ---")
+    await event_loop_monitor.stop()
     ocr_service = None
     llm_service = None
+    dependencies.result_store_instance = None
+    dependencies.export_token = None
 
 
 app = FastAPI(title="IDP POC API", lifespan=lifespan)
@@ -57,5 +76,6 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=500)
 
 app.include_router(endpoints.router, prefix="/api/v1")
@@ -0,0 +1,228 @@
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from app.services.result_store import ResultStore
+
+EXPORT_TABLES = ("extractions", "fields", "line_items")
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+
+def _table_schema(table: str) -> pa.Schema:
+    if table == "extractions":
+        return pa.schema(
+            [
+                ("extraction_id", pa.string()),
+                ("created_at", pa.timestamp("us", tz="UTC")),
+                ("filename", pa.string()),
+                ("document_sha256", pa.string()),
+                ("schema_id", pa.string()),
+                ("item_count", pa.int32()),
+                ("pages", pa.int32()),
+                ("pages_reused", pa.int32()),
+                ("ocr_seconds", pa.float64()),
+                ("llm_seconds", pa.float64()),
+            ]
+        )
+    value_columns = [
+        ("key", pa.string()),
+        ("value", pa.string()),
+        ("value_number", pa.float64()),
+    ]
+    if table == "fields":
+        return pa.schema(
+            [("extraction_id", pa.string()), ("schema_id", pa.string()), *value_columns]
+        )
+    return pa.schema(
+        [
+            ("extraction_id", pa.string()),
+            ("schema_id", pa.string()),
+            ("field", pa.string()),
+            ("item_index", pa.int32()),
+            *value_columns,
+        ]
+    )
+
+
+def _split_line_items(data: dict[str, Any]) -> tuple[dict[str, Any], dict[str, list[dict]]]:
+    """
+    Separates scalar fields from arrays of objects (line items) in extracted data.
+
+    Args:
+        data (Dict[str, Any]): The extracted data of one document.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, List[dict]]]: Remaining fields and line items per field.
+    """
+    fields, line_items = {}, {}
+    for key, value in (data or {}).items():
+        if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            line_items[key] = value
+        else:
+            fields[key] = value
+    return fields, line_items
+
+
+def _key_values(values: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    Turns a dict of extracted values into long-format key/value columns.
+
+    Every value is kept as text in `value`; numbers are also exposed in `value_number`
+    so they can be aggregated without casting. Nested values are JSON-encoded.
+
+    Args:
+        values (Dict[str, Any]): Extracted fields or one line item.
+
+    Yields:
+        Dict[str, Any]: `key`, `value` and `value_number` for each entry.
+    """
+    for key, value in values.items():
+        number = None
+        if value is None:
+            text = None
+        elif isinstance(value, str):
+            text = value
+        elif isinstance(value, bool):
+            text = "true" if value else "false"
+        elif isinstance(value, int | float):
+            text, number = str(value), float(value)
+        else:
+            text = json.dumps(value, ensure_ascii=False)
+        yield {"key": key, "value": text, "value_number": number}
+
+
+def _rows(records: Iterable[dict[str, Any]], table: str) -> Iterator[dict[str, Any]]:
+    """Flattens stored records into rows of the requested table."""
+    for record in records:
+        fields, line_items = _split_line_items(record.get("data"))
+        ids = {"extraction_id": record["extraction_id"], "schema_id": record["schema_id"]}
+
+        if table == "fields":
+            for kv in _key_values(fields):
+                yield {**ids, **kv}
+        elif table == "line_items":
+            for field, items in line_items.items():
+                for index, item in enumerate(items):
+                    for kv in _key_values(item):
+                        yield {**ids, "field": field, "item_index": index, **kv}
+        else:
+            timings = record.get("timings") or {}
+            ocr_stats = record.get("ocr") or {}
+            yield {
+                **ids,
+                "created_at": datetime.fromisoformat(record["created_at"]),
+                "filename": record.get("filename"),
+                "document_sha256": record["document_sha256"],
+                "item_count": sum(len(items) for items in line_items.values()),
+                "pages": ocr_stats.get("pages"),
+                "pages_reused": ocr_stats.get("pages_reused"),
+                "ocr_seconds": timings.get("ocr"),
+                "llm_seconds": timings.get("llm"),
+            }
+
+
+def _batches(
+    records: Iterable[dict[str, Any]], table: str, batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    """Groups table rows into record batches of at most `batch_size` rows."""
+    schema = _table_schema(table)
+    batch = []
+    for row in _rows(records, table):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield pa.RecordBatch.from_pylist(batch, schema=schema)
+            batch = []
+    if batch:
+        yield pa.RecordBatch.from_pylist(batch, schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_export(
+    store: ResultStore, table: str, fmt: str, batch_size: int = 10_000
+) -> Iterator[bytes]:
+    """
+    Streams a table of stored results as a Parquet or Arrow IPC file.
+
+    Records are read, converted and written one batch at a time, and the encoded bytes
+    are yielded after each batch, so memory stays bounded by `batch_size` regardless of
+    how many extractions are stored.
+
+    Args:
+        store (ResultStore): The store to export.
+        table (str): One of "extractions", "fields" or "line_items".
+        fmt (str): Either "parquet" or "arrow".
+        batch_size (int): Maximum rows per record batch (and Parquet row group).
+
+    Yields:
+        bytes: Consecutive chunks of the encoded file.
+    """
+    schema = _table_schema(table)
+    sink = _ChunkSink()
+    output = pa.PythonFile(sink, mode="w")
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(output, schema, compression="zstd")
+    else:
+        writer = ipc.new_file(output, schema)
+
+    with writer:
+        for batch in _batches(store.iter_records(), table, batch_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def write_export(
+    store: ResultStore, table: str, fmt: str, path: str, batch_size: int = 10_000
+) -> None:
+    """
+    Writes a table of stored results to a Parquet or Arrow IPC file on disk.
+
+    Args:
+        store (ResultStore): The store to export.
+        table (str): One of "extractions", "fields" or "line_items".
+        fmt (str): Either "parquet" or "arrow".
+        path (str): Destination file.
+        batch_size (int): Maximum rows per record batch (and Parquet row group).
+    """
+    with open(path, "wb") as f:
+        for chunk in iter_export(store, table, fmt, batch_size):
+            f.write(chunk)
@@ -1,10 +1,20 @@
 import json
 from typing import Any
 
-from groq import Groq
+from groq import (
+    APIConnectionError,
+    APITimeoutError,
+    Groq,
+    InternalServerError,
+    RateLimitError,
+)
 from loguru import logger
 
-from app.core.exception import LLMProcessingError
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.exception import LLMProcessingError, LLMUnavailableError
+
+# Errors that signal an upstream outage rather than a problem with one request
+TRANSIENT_LLM_ERRORS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError)
 
 
 class LLMService:
@@ -14,6 +24,8 @@ class LLMService:
     Attributes:
         client (Groq): An instance of the Groq client for interacting with the LLM.
         model (str): The identifier for the LLM model to use for parsing.
+        circuit (CircuitBreaker): Circuit breaker that fails fast while the LLM API is down.
+                                  Only connection, timeout, 429 and 5xx errors count.
     """
 
     def __init__(self, api_key: str):
@@ -25,6 +37,7 @@ class LLMService:
         """
         self.client = Groq(api_key=api_key)
         self.model = "llama-3.3-70b-versatile"
+        self.circuit = CircuitBreaker("LLM")
 
     def parse_document(self, raw_text: str, target_schema: dict[str, Any]) -> dict[str, Any]:
         """
@@ -64,6 +77,11 @@ class LLMService:
 
         user_prompt = f"DOCUMENT TEXT:\n{raw_text}"
 
+        if not self.circuit.allow_request():
+            raise LLMUnavailableError(
+                "LLM circuit is open", {"retry_after": self.circuit.retry_after()}
+            )
+
         try:
             logger.info("Sending request to LLM...")
             completion = self.client.chat.completions.create(
@@ -75,7 +93,19 @@ class LLMService:
                 temperature=0,
                 response_format={"type": "json_object"},
             )
+        except TRANSIENT_LLM_ERRORS as e:
+            self.circuit.record_failure()
+            logger.error(f"LLM API error: {e}")
+            raise LLMProcessingError("LLM processing failed", {"error": str(e)}) from e
+        except Exception as e:
+            # The API answered (e.g. a 4xx for this input), so it is not an outage
+            self.circuit.record_success()
+            logger.error(f"LLM API error: {e}")
+            raise LLMProcessingError("LLM processing failed", {"error": str(e)}) from e
 
+        self.circuit.record_success()
+
+        try:
             response_content = completion.choices[0].message.content
             parsed_data = json.loads(response_content)
             logger.success("LLM parsing completed")
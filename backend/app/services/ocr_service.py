@@ -1,10 +1,16 @@
+import hashlib
+import tempfile
+from collections.abc import Iterator
+from typing import Any
+
 import cv2
 import numpy as np
 from loguru import logger
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_path, pdfinfo_from_path
 from rapidocr_onnxruntime import RapidOCR
 
 from app.core.exception import InvalidFileError, OCRProcessingError
+from app.services.page_cache import PageCache
 
 
 class OCRService:
@@ -13,13 +19,29 @@ class OCRService:
 
     Attributes:
         engine (RapidOCR): An instance of the RapidOCR engine used for text extraction.
+        page_cache (Optional[PageCache]): Per-page OCR cache; pages whose rendered bitmap
+                                          was seen before are not OCR'd again.
+        max_pages (int): Largest PDF accepted, in pages.
+        render_batch_size (int): PDF pages rasterized per poppler call.
 
     Methods:
-        extract_text(file_bytes: bytes, filename: str) -> str:
+        extract_text(file_bytes: bytes, filename: str, stats: dict | None) -> str:
             Extracts text from the provided file bytes.
+        extract_lines(file_bytes: bytes, filename: str, stats: dict | None) -> list[dict[str, Any]]:
+            Extracts text lines with bounding boxes and confidence scores.
+        probe() -> None:
+            Runs a tiny inference to verify the engine is healthy.
     """
 
-    def __init__(self, det_path: str, rec_path: str, dict_path: str):
+    def __init__(
+        self,
+        det_path: str,
+        rec_path: str,
+        dict_path: str,
+        page_cache: PageCache | None = None,
+        max_pages: int = 50,
+        render_batch_size: int = 4,
+    ):
         """
         Initializes the OCRService with the specified model paths.
 
@@ -27,73 +49,213 @@ class OCRService:
             det_path (str): Path to the detection model.
             rec_path (str): Path to the recognition model.
             dict_path (str): Path to the recognition keys dictionary.
+            page_cache (Optional[PageCache]): Optional per-page OCR cache.
+            max_pages (int): Largest PDF accepted, in pages.
+            render_batch_size (int): PDF pages rasterized per poppler call.
         """
         logger.info("Loading OCR Models...")
         self.engine = RapidOCR(
             det_model_path=det_path, rec_model_path=rec_path, rec_keys_path=dict_path
         )
+        self.page_cache = page_cache
+        self.max_pages = max_pages
+        self.render_batch_size = render_batch_size
+        # Cached pages are only valid for the models that produced them
+        self._cache_salt = "|".join([det_path, rec_path, dict_path]).encode()
         logger.success("OCR Models Loaded Successfully.")
 
-    def _process_image_bytes(self, file_bytes: bytes, filename: str) -> np.ndarray:
+    def _count_pages(self, pdf_path: str) -> int:
+        """
+        Counts the pages of a PDF without rendering them.
+
+        Args:
+            pdf_path (str): Path to the PDF file.
+
+        Returns:
+            int: Number of pages.
+
+        Raises:
+            OCRProcessingError: If the PDF is empty or cannot be read.
+            InvalidFileError: If the PDF has more than `max_pages` pages.
         """
-        Processes the input file bytes and converts them into an OpenCV image.
+        try:
+            page_count = int(pdfinfo_from_path(pdf_path)["Pages"])
+            if page_count < 1:
+                raise ValueError("Empty PDF")
+        except Exception as e:
+            raise OCRProcessingError("Failed to process PDF", {"error": str(e)}) from e
+
+        if page_count > self.max_pages:
+            raise InvalidFileError(
+                f"PDF has {page_count} pages. Max pages: {self.max_pages}",
+                {"pages": page_count},
+            )
+        return page_count
+
+    def _process_image_bytes(
+        self, file_bytes: bytes, filename: str
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Processes the input file bytes and converts them into OpenCV images, one per page.
         This method supports both PDF and standard image formats.
 
+        A PDF is written to a single temporary file and rendered in batches of
+        `render_batch_size` pages; pages are yielded one at a time so that only one
+        batch is held in memory.
+
         Args:
             file_bytes (bytes): The content of the file in bytes.
             filename (str): The name of the file to determine its type.
 
-        Returns:
-            np.ndarray: The processed image in OpenCV format.
+        Yields:
+            Tuple[int, np.ndarray]: The 1-based page number and the page in OpenCV format.
 
         Raises:
-            ValueError: If the PDF is empty or if the image file is invalid.
+            OCRProcessingError: If the PDF is empty or cannot be rasterized.
+            InvalidFileError: If the image file is invalid or the PDF has too many pages.
         """
         logger.info("Preproccess image2bytes...")
-        if filename.lower().endswith(".pdf"):
-            try:
-                images = convert_from_bytes(file_bytes, first_page=1, last_page=1)
-                if not images:
-                    raise ValueError("Empty PDF")
-                pil_image = images[0]
-                open_cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-                return open_cv_image
-            except Exception as e:
-                raise OCRProcessingError("Failed to process PDF", {"error": str(e)}) from e
-
-        nparr = np.frombuffer(file_bytes, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if img is None:
-            raise InvalidFileError("Invalid image file")
-        return img
-
-    def extract_text(self, file_bytes: bytes, filename: str) -> str:
+        if not filename.lower().endswith(".pdf"):
+            nparr = np.frombuffer(file_bytes, np.uint8)
+            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            if img is None:
+                raise InvalidFileError("Invalid image file")
+            yield 1, img
+            return
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+            pdf_file.write(file_bytes)
+            pdf_file.flush()
+            page_count = self._count_pages(pdf_file.name)
+
+            for first_page in range(1, page_count + 1, self.render_batch_size):
+                last_page = min(first_page + self.render_batch_size - 1, page_count)
+                try:
+                    images = convert_from_path(
+                        pdf_file.name, first_page=first_page, last_page=last_page
+                    )
+                except Exception as e:
+                    raise OCRProcessingError("Failed to process PDF", {"error": str(e)}) from e
+
+                for offset in range(len(images)):
+                    pil_image, images[offset] = images[offset], None
+                    yield first_page + offset, cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+
+    def _page_key(self, img: np.ndarray) -> str:
         """
-        Extracts text from the provided file bytes.
+        Hashes a rendered page bitmap into a cache key.
+
+        Args:
+            img (np.ndarray): The rendered page.
+
+        Returns:
+            str: Hex digest identifying the page content for the loaded models.
+        """
+        digest = hashlib.sha256(self._cache_salt)
+        digest.update(str(img.shape).encode())
+        digest.update(np.ascontiguousarray(img).data)
+        return digest.hexdigest()
+
+    def _ocr_page(self, img: np.ndarray) -> list[dict[str, Any]]:
+        """
+        Runs the OCR engine on a single page.
+
+        Args:
+            img (np.ndarray): The rendered page.
+
+        Returns:
+            List[Dict[str, Any]]: The detected lines with `text`, `box` and `score`.
+        """
+        result, _ = self.engine(img, use_det=True, use_rec=True)
+        if not result:
+            return []
+        return [
+            {
+                "text": text,
+                "box": [[float(x), float(y)] for x, y in box],
+                "score": float(score),
+            }
+            for box, text, score in result
+        ]
+
+    def probe(self) -> None:
+        """
+        Runs a tiny OCR inference to check that the engine is able to serve requests.
+
+        Raises:
+            OCRProcessingError: If the inference fails.
+        """
+        try:
+            self.engine(np.full((32, 32, 3), 255, dtype=np.uint8), use_det=True, use_rec=True)
+        except Exception as e:
+            raise OCRProcessingError("OCR probe failed", {"error": str(e)}) from e
+
+    def extract_lines(
+        self, file_bytes: bytes, filename: str, stats: dict[str, int] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Extracts text lines together with their layout from the provided file bytes.
 
         Args:
             file_bytes (bytes): The content of the file in bytes.
             filename (str): The name of the file to determine its type.
+            stats (Optional[Dict[str, int]]): If given, filled with `pages` and `pages_reused`.
 
         Returns:
-            str: The extracted text. Returns an empty string if no text is found.
+            List[Dict[str, Any]]: One entry per detected line with `page` (1-based), `text`,
+                                  `box` (four [x, y] corner points) and `score`.
         """
         try:
-            img = self._process_image_bytes(file_bytes, filename)
-            logger.info("Running OCR extraction...")
-            result, _ = self.engine(img, use_det=True, use_rec=True)
+            lines = []
+            page_count = 0
+            reused = 0
+            for page_number, img in self._process_image_bytes(file_bytes, filename):
+                page_count = page_number
+                key = self._page_key(img) if self.page_cache is not None else None
+                page_lines = self.page_cache.get(key) if key is not None else None
+                if page_lines is not None:
+                    reused += 1
+                else:
+                    page_lines = self._ocr_page(img)
+                    if key is not None:
+                        self.page_cache.put(key, page_lines)
+                # Release the bitmap before moving on to the next page
+                del img
+                lines.extend({"page": page_number, **line} for line in page_lines)
+
+            if stats is not None:
+                stats["pages"] = page_count
+                stats["pages_reused"] = reused
 
-            if not result:
+            if not lines:
                 logger.warning("No text detected in document")
-                return ""
+                return []
 
-            text_lines = [line[1] for line in result]
-            extracted_text = " ".join(text_lines)
-            logger.success(f"Extracted {len(text_lines)} lines of text")
-            return extracted_text
+            logger.success(
+                f"Extracted {len(lines)} lines of text from {page_count} page(s) "
+                f"({reused}/{page_count} pages reused from cache)"
+            )
+            return lines
 
         except (InvalidFileError, OCRProcessingError):
             raise
         except Exception as e:
             logger.error(f"Unexpected OCR error: {e}")
             raise OCRProcessingError("OCR extraction failed", {"error": str(e)}) from e
+
+    def extract_text(
+        self, file_bytes: bytes, filename: str, stats: dict[str, int] | None = None
+    ) -> str:
+        """
+        Extracts text from the provided file bytes.
+
+        Args:
+            file_bytes (bytes): The content of the file in bytes.
+            filename (str): The name of the file to determine its type.
+            stats (Optional[Dict[str, int]]): If given, filled with `pages` and `pages_reused`.
+
+        Returns:
+            str: The extracted text. Returns an empty string if no text is found.
+        """
+        lines = self.extract_lines(file_bytes, filename, stats)
+        return " ".join(line["text"] for line in lines)
@@ -0,0 +1,109 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+
+class PageCache:
+    """
+    Bounded on-disk LRU cache of OCR results, one entry per document page.
+
+    Entries are stored in a SQLite database so that several worker processes can share
+    the same cache directory. When the number of entries exceeds `max_entries`, the
+    least recently used pages are evicted.
+
+    The cache is best effort: SQLite errors (locked or corrupt database, full disk) are
+    logged and treated as a miss or a skipped write, so they never fail a request.
+
+    Attributes:
+        path (Path): Location of the SQLite database file.
+        max_entries (int): Maximum number of pages kept on disk.
+    """
+
+    def __init__(self, directory: str, max_entries: int):
+        """
+        Initializes the cache, creating the directory and database if needed.
+
+        Args:
+            directory (str): Directory holding the cache database.
+            max_entries (int): Maximum number of pages kept on disk.
+        """
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.path = Path(directory) / "pages.sqlite3"
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    key TEXT PRIMARY KEY,
+                    lines TEXT NOT NULL,
+                    last_access INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)"
+            )
+        logger.info(f"OCR page cache at {self.path} (max {max_entries} pages)")
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        """
+        Looks up the OCR lines of a page and marks it as recently used.
+
+        Args:
+            key (str): Page content hash.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The cached lines, or None on a miss.
+        """
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute("SELECT lines FROM pages WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute(
+                    "UPDATE pages SET last_access = ? WHERE key = ?", (time.time_ns(), key)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"OCR page cache read failed, treating as a miss: {e}")
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, lines: list[dict[str, Any]]) -> None:
+        """
+        Stores the OCR lines of a page, evicting least recently used pages if over capacity.
+
+        Args:
+            key (str): Page content hash.
+            lines (List[Dict[str, Any]]): OCR lines of the page.
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (key, lines, last_access) VALUES (?, ?, ?)",
+                    (key, json.dumps(lines), time.time_ns()),
+                )
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+                if count > self.max_entries:
+                    self._conn.execute(
+                        """
+                        DELETE FROM pages WHERE key IN (
+                            SELECT key FROM pages ORDER BY last_access ASC LIMIT ?
+                        )
+                        """,
+                        (count - self.max_entries,),
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"OCR page cache write failed, page not cached: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        return count
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import threading
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+
+def schema_id(target_schema: dict[str, Any]) -> str:
+    """
+    Derives a stable identifier for an extraction schema.
+
+    Args:
+        target_schema (Dict[str, Any]): The schema used for extraction.
+
+    Returns:
+        str: Short hex digest of the canonical JSON form of the schema.
+    """
+    canonical = json.dumps(target_schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+class ResultStore:
+    """
+    Append-only local store of extraction results, one JSON record per line.
+
+    Records are only ever appended, so concurrent workers can share the same file and an
+    export can read it line by line without loading it into memory.
+
+    Attributes:
+        path (Path): Location of the JSON Lines file.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initializes the store, creating its directory if needed.
+
+        Args:
+            directory (str): Directory holding the results file.
+        """
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.path = Path(directory) / "extractions.jsonl"
+        self._lock = threading.Lock()
+        logger.info(f"Persisting extraction results to {self.path}")
+
+    def append(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        target_schema: dict[str, Any],
+        data: dict[str, Any],
+        timings: dict[str, float],
+        ocr_stats: dict[str, int] | None = None,
+    ) -> str:
+        """
+        Appends one extraction result.
+
+        Args:
+            file_bytes (bytes): The uploaded document, hashed to identify it.
+            filename (str): Original filename.
+            target_schema (Dict[str, Any]): The schema used for extraction.
+            data (Dict[str, Any]): The extracted data.
+            timings (Dict[str, float]): Seconds spent per stage (e.g. `ocr`, `llm`).
+            ocr_stats (Optional[Dict[str, int]]): Page counts reported by the OCR service.
+
+        Returns:
+            str: The identifier assigned to the stored extraction.
+        """
+        extraction_id = uuid.uuid4().hex
+        record = {
+            "extraction_id": extraction_id,
+            "created_at": datetime.now(UTC).isoformat(),
+            "filename": filename,
+            "document_sha256": hashlib.sha256(file_bytes).hexdigest(),
+            "schema_id": schema_id(target_schema),
+            "data": data,
+            "timings": timings,
+            "ocr": ocr_stats or {},
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line)
+        return extraction_id
+
+    def iter_records(self) -> Iterator[dict[str, Any]]:
+        """
+        Yields stored records in insertion order without loading the whole file.
+
+        Yields:
+            Dict[str, Any]: One extraction record.
+        """
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A worker killed mid-write can leave a truncated last line
+                    logger.warning(f"Skipping corrupt record in {self.path}")
@@ -29,9 +29,18 @@ def mock_llm_service():
         "invoice_date": "2024-01-01",
         "total_amount": 1000.00
     }
+    mock.circuit.state = "closed"
     return mock
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_ocr_probe(monkeypatch):
+    """Drop any cached readiness probe result between tests"""
+    from app.core.health import ocr_probe
+
+    monkeypatch.setattr(ocr_probe, "_checked_at", None)
+
+
 @pytest.fixture(scope="function")
 def client(mock_ocr_service, mock_llm_service):
     """
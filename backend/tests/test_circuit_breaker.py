@@ -0,0 +1,91 @@
+from unittest.mock import MagicMock
+
+import groq
+import httpx
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.exception import LLMProcessingError, LLMUnavailableError
+from app.services import llm_service as llm_module
+from app.services.llm_service import LLMService
+
+
+def test_opens_after_consecutive_failures():
+    """The circuit opens once the failure threshold is reached"""
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_after() > 1
+
+
+def test_success_resets_failures():
+    """A success between failures keeps the circuit closed"""
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_trial():
+    """After the timeout a single trial call decides the circuit state"""
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+GROQ_REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+
+
+def make_llm_service(monkeypatch, error):
+    """LLMService whose Groq client always raises `error`"""
+    client = MagicMock()
+    client.chat.completions.create.side_effect = error
+    monkeypatch.setattr(llm_module, "Groq", lambda api_key: client)
+
+    service = LLMService(api_key="test")
+    service.circuit = CircuitBreaker("LLM", failure_threshold=2, reset_timeout=60)
+    return service, client
+
+
+def test_llm_service_fails_fast_when_circuit_open(monkeypatch):
+    """LLMService stops calling the API once its circuit opens"""
+    service, client = make_llm_service(monkeypatch, groq.APIConnectionError(request=GROQ_REQUEST))
+
+    for _ in range(2):
+        with pytest.raises(LLMProcessingError):
+            service.parse_document("Invoice text", {"total": {"type": "number"}})
+
+    with pytest.raises(LLMUnavailableError):
+        service.parse_document("Invoice text", {"total": {"type": "number"}})
+    assert client.chat.completions.create.call_count == 2
+
+
+def test_llm_request_errors_do_not_open_circuit(monkeypatch):
+    """A 4xx caused by one bad request does not count as an outage"""
+    error = groq.BadRequestError(
+        "context length exceeded",
+        response=httpx.Response(400, request=GROQ_REQUEST),
+        body=None,
+    )
+    service, client = make_llm_service(monkeypatch, error)
+
+    for _ in range(5):
+        with pytest.raises(LLMProcessingError):
+            service.parse_document("Invoice text", {"total": {"type": "number"}})
+
+    assert service.circuit.state == CircuitBreaker.CLOSED
+    assert client.chat.completions.create.call_count == 5
@@ -0,0 +1,70 @@
+from app.core.concurrency import AdaptiveConcurrencyLimiter
+
+
+def make_limiter(**overrides):
+    """Create a limiter with small, test-friendly bounds"""
+    config = {
+        "initial_limit": 4,
+        "min_limit": 1,
+        "max_limit": 8,
+        "latency_targets": {"ocr": 1.0, "llm": 2.0},
+    }
+    config.update(overrides)
+    return AdaptiveConcurrencyLimiter(**config)
+
+
+def test_sheds_beyond_limit():
+    """Requests beyond the current limit are rejected"""
+    limiter = make_limiter(initial_limit=2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release({})
+    assert limiter.try_acquire()
+
+
+def test_limit_grows_when_busy_and_fast():
+    """Additive increase while under target and at least half busy"""
+    limiter = make_limiter(initial_limit=2)
+
+    limiter.try_acquire()
+    limiter.try_acquire()
+    limiter.release({"ocr": 0.5, "llm": 1.0})
+
+    assert limiter.current_limit == 3
+
+
+def test_limit_does_not_grow_when_idle():
+    """An underused limit is not inflated"""
+    limiter = make_limiter(initial_limit=4)
+
+    limiter.try_acquire()
+    limiter.release({"ocr": 0.5, "llm": 1.0})
+
+    assert limiter.current_limit == 4
+
+
+def test_limit_backs_off_on_breach():
+    """Multiplicative decrease when any stage misses its target"""
+    limiter = make_limiter(initial_limit=8, backoff_ratio=0.5)
+
+    limiter.try_acquire()
+    limiter.release({"ocr": 5.0})
+    assert limiter.current_limit == 4
+
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release({"llm": 10.0})
+    assert limiter.current_limit == 1
+
+
+def test_retry_after_tracks_service_time():
+    """Retry-After follows the smoothed end-to-end latency"""
+    limiter = make_limiter()
+    assert limiter.retry_after() == 1
+
+    limiter.try_acquire()
+    limiter.release({"ocr": 1.5, "llm": 1.8})
+    assert limiter.retry_after() == 4
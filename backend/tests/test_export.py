@@ -0,0 +1,172 @@
+import io
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+import pytest
+
+from app.api import dependencies
+from app.api.dependencies import get_result_store
+from app.main import app
+from app.services import export_service
+from app.services.result_store import ResultStore, schema_id
+
+
+INVOICE_DATA = {
+    "vendor_name": "ACME Corp",
+    "total_amount": 30,
+    "items": [
+        {"name": "Widget", "qty": 2, "price": 10},
+        {"name": "Gadget", "qty": 1, "price": 10},
+    ],
+}
+
+
+@pytest.fixture(scope="function")
+def result_store(tmp_path):
+    """Result store in a temporary directory"""
+    return ResultStore(str(tmp_path))
+
+
+def fill_store(store, count):
+    """Append `count` invoice extractions to the store"""
+    for i in range(count):
+        store.append(
+            f"document {i}".encode(),
+            f"invoice-{i}.pdf",
+            {"vendor_name": {"type": "string"}},
+            INVOICE_DATA,
+            {"ocr": 1.5, "llm": 2.0},
+            {"pages": 2, "pages_reused": 1},
+        )
+
+
+def test_result_store_appends_records(result_store):
+    """Records are appended with document hash and schema id"""
+    schema = {"vendor_name": {"type": "string"}}
+    extraction_id = result_store.append(b"pdf", "a.pdf", schema, INVOICE_DATA, {"ocr": 1.0})
+
+    records = list(result_store.iter_records())
+
+    assert len(records) == 1
+    assert records[0]["extraction_id"] == extraction_id
+    assert records[0]["schema_id"] == schema_id(schema)
+    assert len(records[0]["document_sha256"]) == 64
+
+
+def test_result_store_skips_truncated_line(result_store):
+    """A partially written last line does not break reading"""
+    fill_store(result_store, 2)
+    with result_store.path.open("a") as f:
+        f.write('{"extraction_id": "trunc')
+
+    assert len(list(result_store.iter_records())) == 2
+
+
+def test_export_parquet_in_batches(result_store):
+    """Parquet export is streamed in several chunks, one row group per batch"""
+    fill_store(result_store, 5)
+
+    chunks = list(export_service.iter_export(result_store, "extractions", "parquet", batch_size=2))
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+
+    assert len(chunks) > 2
+    assert parquet.metadata.num_rows == 5
+    assert parquet.metadata.num_row_groups == 3
+
+    table = parquet.read()
+    row = table.to_pylist()[0]
+    assert row["item_count"] == 2
+    assert row["pages_reused"] == 1
+    assert row["ocr_seconds"] == 1.5
+
+
+def test_export_fields_long_format(result_store):
+    """Scalar fields become one key/value row each, with numbers typed"""
+    fill_store(result_store, 2)
+
+    data = b"".join(export_service.iter_export(result_store, "fields", "parquet"))
+    rows = pq.read_table(io.BytesIO(data)).to_pylist()
+
+    assert len(rows) == 4
+    assert {(r["key"], r["value"], r["value_number"]) for r in rows} == {
+        ("vendor_name", "ACME Corp", None),
+        ("total_amount", "30", 30.0),
+    }
+
+
+def test_export_line_items_arrow(result_store):
+    """Line items are flattened into key/value rows keyed by extraction and item index"""
+    fill_store(result_store, 3)
+
+    data = b"".join(export_service.iter_export(result_store, "line_items", "arrow"))
+    table = ipc.open_file(pa.BufferReader(data)).read_all()
+
+    # 3 extractions x 2 items x 3 attributes
+    assert table.num_rows == 18
+    rows = table.to_pylist()
+    assert rows[0]["field"] == "items"
+    assert [(r["item_index"], r["key"]) for r in rows[:4]] == [
+        (0, "name"),
+        (0, "qty"),
+        (0, "price"),
+        (1, "name"),
+    ]
+    assert rows[3]["value"] == "Gadget"
+    assert rows[4]["value_number"] == 1.0
+    assert len({r["extraction_id"] for r in rows}) == 3
+
+
+@pytest.fixture(scope="function")
+def export_token(monkeypatch):
+    """Enable the export endpoint with a known token"""
+    monkeypatch.setattr(dependencies, "export_token", "s3cret")
+    return "s3cret"
+
+
+def test_extract_and_export_endpoints(client, result_store, export_token):
+    """Successful extractions are persisted and exported over HTTP"""
+    app.dependency_overrides[get_result_store] = lambda: result_store
+
+    files = {"file": ("invoice.jpg", b"image bytes", "image/jpeg")}
+    response = client.post("/api/v1/extract", files=files)
+
+    assert response.status_code == 200
+    extraction_id = response.json()["extraction_id"]
+
+    response = client.get(
+        "/api/v1/export?table=extractions&format=parquet",
+        headers={"Authorization": f"Bearer {export_token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("extraction_id").to_pylist() == [extraction_id]
+
+
+def test_export_disabled_without_token(client, result_store):
+    """Export is unavailable unless an export token is configured"""
+    app.dependency_overrides[get_result_store] = lambda: result_store
+
+    response = client.get("/api/v1/export")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}])
+def test_export_requires_token(client, result_store, export_token, headers):
+    """Export rejects requests without the configured token"""
+    app.dependency_overrides[get_result_store] = lambda: result_store
+
+    response = client.get("/api/v1/export", headers=headers)
+
+    assert response.status_code == 401
+
+
+def test_export_disabled_without_store(client, export_token):
+    """Export is unavailable when persistence is not enabled"""
+    response = client.get("/api/v1/export", headers={"Authorization": f"Bearer {export_token}"})
+
+    assert response.status_code == 404
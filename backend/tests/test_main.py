@@ -1,4 +1,6 @@
 import json
+
+import msgpack
 import pytest
 
 
@@ -202,4 +204,293 @@ def test_allowed_file_types(client):
         response = client.post("/api/v1/extract", files=files)
         
         # Should not fail on file type (might fail on other validation)
-        assert response.status_code != 400 or "Invalid file type" not in response.json()["detail"]
\ No newline at end of file
+        assert response.status_code != 400 or "Invalid file type" not in response.json()["detail"]
+
+def test_extract_document_compact_response(client, mock_ocr_service, mock_llm_service):
+    """Test that raw_text and schema can be omitted from the response"""
+    mock_ocr_service.extract_text.return_value = "Invoice text"
+
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post(
+        "/api/v1/extract?include_raw_text=false&include_schema=false", files=files
+    )
+
+    assert response.status_code == 200
+    json_resp = response.json()
+
+    assert json_resp["status"] == "success"
+    assert "raw_text" not in json_resp
+    assert "extraction_schema_used" not in json_resp
+    assert "layout" not in json_resp
+
+
+def test_extract_document_with_layout(client, mock_ocr_service, mock_llm_service):
+    """Test that OCR layout is returned when requested"""
+    mock_ocr_service.extract_lines.return_value = [
+        {"text": "INVOICE", "box": [[0, 0], [10, 0], [10, 5], [0, 5]], "score": 0.98},
+        {"text": "Total: 100", "box": [[0, 10], [10, 10], [10, 15], [0, 15]], "score": 0.95},
+    ]
+
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post("/api/v1/extract?include_layout=true", files=files)
+
+    assert response.status_code == 200
+    json_resp = response.json()
+
+    assert json_resp["raw_text"] == "INVOICE Total: 100"
+    assert len(json_resp["layout"]) == 2
+    mock_ocr_service.extract_text.assert_not_called()
+
+
+def vary_tokens(response):
+    """Split the Vary header into its field names"""
+    return [token.strip() for token in response.headers.get("vary", "").split(",")]
+
+
+def test_extract_document_msgpack(client, mock_ocr_service, mock_llm_service):
+    """Test msgpack response encoding"""
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post(
+        "/api/v1/extract", files=files, headers={"Accept": "application/msgpack"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert "Accept" in vary_tokens(response)
+    payload = msgpack.unpackb(response.content)
+    assert payload["status"] == "success"
+    assert payload["data"]["vendor_name"] == "Test Vendor"
+
+
+@pytest.mark.parametrize(
+    "accept",
+    ["application/json, application/msgpack;q=0", "application/json, application/msgpack;q=0.5"],
+)
+def test_extract_document_accept_prefers_json(client, accept):
+    """Test msgpack is not negotiated when refused or ranked below JSON"""
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post("/api/v1/extract", files=files, headers={"Accept": accept})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "Accept" in vary_tokens(response)
+
+
+def test_extract_document_explicit_format_does_not_vary(client):
+    """Test an explicit format param does not depend on the Accept header"""
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post("/api/v1/extract?format=msgpack", files=files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert "Accept" not in vary_tokens(response)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_extract_document_compressed(client, mock_ocr_service, encoding):
+    """Test gzip/zstd response compression negotiation"""
+    mock_ocr_service.extract_text.return_value = "Invoice line " * 100
+
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post(
+        "/api/v1/extract", files=files, headers={"Accept-Encoding": encoding}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == encoding
+    assert response.json()["status"] == "success"
+
+
+def test_health_reports_concurrency_limit(client):
+    """Test that the adaptive concurrency limit is exposed on health"""
+    response = client.get("/api/v1/health")
+
+    assert response.status_code == 200
+    concurrency = response.json()["concurrency"]
+    assert concurrency["limit"] >= 1
+    assert concurrency["in_flight"] == 0
+
+
+def test_extract_document_sheds_load_at_capacity(client, monkeypatch, mock_ocr_service):
+    """Test 429 with Retry-After when the concurrency limit is reached"""
+    from app.core.concurrency import concurrency_limiter
+
+    monkeypatch.setattr(concurrency_limiter, "in_flight", concurrency_limiter.current_limit)
+
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post("/api/v1/extract", files=files)
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    mock_ocr_service.extract_text.assert_not_called()
+
+
+def test_readiness_check_ignores_concurrency_limit(client, monkeypatch):
+    """Test a saturated concurrency limit is reported but does not fail readiness"""
+    from app.core.concurrency import concurrency_limiter
+
+    monkeypatch.setattr(concurrency_limiter, "in_flight", concurrency_limiter.current_limit)
+
+    response = client.get("/api/v1/health/ready")
+
+    assert response.status_code == 200
+    concurrency = response.json()["concurrency"]
+    assert concurrency["in_flight"] == concurrency["limit"]
+
+
+def test_liveness_check(client):
+    """Test liveness endpoint"""
+    response = client.get("/api/v1/health/live")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "alive"
+
+
+def test_readiness_check(client, mock_ocr_service):
+    """Test readiness endpoint reports its checks and is not rate limited"""
+    for _ in range(10):
+        response = client.get("/api/v1/health/ready")
+        assert response.status_code == 200
+
+    json_resp = response.json()
+    assert json_resp["status"] == "ready"
+    assert all(json_resp["checks"].values())
+    assert json_resp["llm_circuit"] == "closed"
+    assert "queue_depth" in json_resp["worker_pool"]
+    assert "event_loop_lag_seconds" in json_resp
+
+    # The OCR probe result is cached
+    mock_ocr_service.probe.assert_called_once()
+
+
+def test_readiness_check_ocr_probe_failure(client, mock_ocr_service):
+    """Test readiness fails when the OCR probe fails"""
+    from app.core.exception import OCRProcessingError
+
+    mock_ocr_service.probe.side_effect = OCRProcessingError("OCR probe failed")
+
+    response = client.get("/api/v1/health/ready")
+
+    assert response.status_code == 503
+    json_resp = response.json()
+    assert json_resp["status"] == "not_ready"
+    assert json_resp["checks"]["ocr"] is False
+    assert json_resp["ocr_probe"]["error"] == "OCR probe failed"
+
+
+def test_readiness_check_llm_circuit_open(client, mock_llm_service):
+    """Test an open LLM circuit is reported but does not fail readiness"""
+    mock_llm_service.circuit.state = "open"
+
+    response = client.get("/api/v1/health/ready")
+
+    assert response.status_code == 200
+    json_resp = response.json()
+    assert json_resp["status"] == "ready"
+    assert json_resp["llm_circuit"] == "open"
+
+
+def test_extract_document_llm_unavailable(client, mock_llm_service):
+    """Test 503 with Retry-After when the LLM circuit is open"""
+    from app.core.exception import LLMUnavailableError
+
+    mock_llm_service.parse_document.side_effect = LLMUnavailableError(
+        "LLM circuit is open", {"retry_after": 12}
+    )
+
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post("/api/v1/extract", files=files)
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "12"
+
+
+def test_extract_document_reports_per_page_ocr_latency(
+    client, monkeypatch, mock_ocr_service
+):
+    """Test the concurrency limiter is fed OCR seconds per OCR'd page"""
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    from app.api.v1 import endpoints
+    from app.core.concurrency import concurrency_limiter
+
+    def extract_text(file_bytes, filename, stats):
+        stats.update({"pages": 30, "pages_reused": 10})
+        return "Invoice text"
+
+    mock_ocr_service.extract_text.side_effect = extract_text
+    clock = iter([0.0, 20.0, 20.0, 21.0])
+    monkeypatch.setattr(endpoints, "time", SimpleNamespace(perf_counter=lambda: next(clock)))
+    release = MagicMock()
+    monkeypatch.setattr(concurrency_limiter, "release", release)
+
+    files = {
+        'file': ('invoice.pdf', b'pdf bytes', 'application/pdf')
+    }
+
+    response = client.post("/api/v1/extract", files=files)
+
+    assert response.status_code == 200
+    assert response.json()["ocr"] == {"pages": 30, "pages_reused": 10}
+    release.assert_called_once_with({"ocr": 1.0, "llm": 1.0})
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        ("ocr", {"ocr": 20.0}),
+        ("invalid", {}),
+    ],
+)
+def test_extract_document_reports_failed_ocr_latency(
+    client, monkeypatch, mock_ocr_service, error, expected
+):
+    """Test a failed OCR call still feeds its latency to the concurrency limiter"""
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    from app.api.v1 import endpoints
+    from app.core.concurrency import concurrency_limiter
+    from app.core.exception import InvalidFileError, OCRProcessingError
+
+    mock_ocr_service.extract_text.side_effect = (
+        OCRProcessingError("OCR failed") if error == "ocr" else InvalidFileError("Invalid image")
+    )
+    clock = iter([0.0, 20.0])
+    monkeypatch.setattr(endpoints, "time", SimpleNamespace(perf_counter=lambda: next(clock)))
+    release = MagicMock()
+    monkeypatch.setattr(concurrency_limiter, "release", release)
+
+    files = {
+        'file': ('invoice.jpg', b'image bytes', 'image/jpeg')
+    }
+
+    response = client.post("/api/v1/extract", files=files)
+
+    assert response.status_code in (400, 500)
+    release.assert_called_once_with(expected)
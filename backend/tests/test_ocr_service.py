@@ -0,0 +1,137 @@
+import sqlite3
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.exception import InvalidFileError
+from app.services import ocr_service as ocr_module
+from app.services.ocr_service import OCRService
+from app.services.page_cache import PageCache
+
+
+def make_page(value):
+    """Create a small solid-colour page bitmap"""
+    return np.full((20, 30, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture(scope="function")
+def fake_engine(monkeypatch):
+    """Replace RapidOCR with an engine that reports one line per page"""
+    engine = MagicMock()
+    engine.side_effect = lambda img, **kwargs: (
+        [[[[0, 0], [1, 0], [1, 1], [0, 1]], f"page-{int(img[0, 0, 0])}", 0.9]],
+        None,
+    )
+    monkeypatch.setattr(ocr_module, "RapidOCR", lambda **kwargs: engine)
+    return engine
+
+
+@pytest.fixture(scope="function")
+def cached_ocr(tmp_path, fake_engine):
+    """OCRService backed by a page cache in a temporary directory"""
+    cache = PageCache(str(tmp_path), max_entries=10)
+    return OCRService("det.onnx", "rec.onnx", "dict.txt", page_cache=cache)
+
+
+def mock_pdf(monkeypatch, pages):
+    """Serve PDFs whose bytes name a list of page colours, recording each render call"""
+    rendered = []
+
+    def read_name(path):
+        with open(path, "rb") as f:
+            return f.read().decode()
+
+    def convert_from_path(path, first_page, last_page):
+        rendered.append((first_page, last_page))
+        colours = pages[read_name(path)][first_page - 1 : last_page]
+        return [Image.fromarray(make_page(colour)) for colour in colours]
+
+    monkeypatch.setattr(
+        ocr_module, "pdfinfo_from_path", lambda path: {"Pages": len(pages[read_name(path)])}
+    )
+    monkeypatch.setattr(ocr_module, "convert_from_path", convert_from_path)
+    return rendered
+
+
+def test_image_page_is_reused(cached_ocr, fake_engine):
+    """Re-uploading the same image skips OCR"""
+    _, png = cv2.imencode(".png", make_page(7))
+
+    stats = {}
+    assert cached_ocr.extract_text(png.tobytes(), "scan.png", stats) == "page-7"
+    assert stats == {"pages": 1, "pages_reused": 0}
+
+    stats = {}
+    assert cached_ocr.extract_text(png.tobytes(), "scan.png", stats) == "page-7"
+    assert stats == {"pages": 1, "pages_reused": 1}
+    assert fake_engine.call_count == 1
+
+
+def test_amended_pdf_only_ocrs_changed_pages(cached_ocr, fake_engine, monkeypatch):
+    """Only new or changed pages go through OCR, text stays in page order"""
+    pages = {"v1": [1, 2, 3], "v2": [1, 5, 3, 4]}
+    mock_pdf(monkeypatch, pages)
+
+    cached_ocr.extract_text(b"v1", "invoice.pdf")
+    assert fake_engine.call_count == 3
+
+    stats = {}
+    lines = cached_ocr.extract_lines(b"v2", "invoice.pdf", stats)
+
+    assert [line["text"] for line in lines] == ["page-1", "page-5", "page-3", "page-4"]
+    assert [line["page"] for line in lines] == [1, 2, 3, 4]
+    assert stats == {"pages": 4, "pages_reused": 2}
+    assert fake_engine.call_count == 5
+
+
+def test_pdf_over_page_limit_is_rejected(cached_ocr, fake_engine, monkeypatch):
+    """PDFs with too many pages are refused before anything is rendered"""
+    rendered = mock_pdf(monkeypatch, {"long": [1] * (cached_ocr.max_pages + 1)})
+
+    with pytest.raises(InvalidFileError, match="Max pages"):
+        cached_ocr.extract_text(b"long", "long.pdf")
+
+    assert rendered == []
+    fake_engine.assert_not_called()
+
+
+def test_pdf_is_rendered_in_batches(cached_ocr, fake_engine, monkeypatch):
+    """Pages are rasterized a few at a time from a single file, in page order"""
+    rendered = mock_pdf(monkeypatch, {"long": list(range(1, 11))})
+    cached_ocr.render_batch_size = 4
+
+    lines = cached_ocr.extract_lines(b"long", "long.pdf")
+
+    assert rendered == [(1, 4), (5, 8), (9, 10)]
+    assert [line["page"] for line in lines] == list(range(1, 11))
+    assert [line["text"] for line in lines] == [f"page-{n}" for n in range(1, 11)]
+
+
+def test_page_cache_errors_do_not_fail_ocr(cached_ocr, fake_engine):
+    """A locked or broken cache database falls back to running OCR"""
+    _, png = cv2.imencode(".png", make_page(7))
+    cached_ocr.page_cache._conn = MagicMock()
+    cached_ocr.page_cache._conn.execute.side_effect = sqlite3.OperationalError("database is locked")
+
+    stats = {}
+    assert cached_ocr.extract_text(png.tobytes(), "scan.png", stats) == "page-7"
+    assert stats == {"pages": 1, "pages_reused": 0}
+    fake_engine.assert_called_once()
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path):
+    """The on-disk cache stays within its bound, dropping the oldest pages"""
+    cache = PageCache(str(tmp_path), max_entries=2)
+
+    cache.put("a", [{"text": "a"}])
+    cache.put("b", [{"text": "b"}])
+    cache.get("a")
+    cache.put("c", [{"text": "c"}])
+
+    assert len(cache) == 2
+    assert cache.get("a") == [{"text": "a"}]
+    assert cache.get("b") is None
+    assert cache.get("c") == [{"text": "c"}]